@@ -3,14 +3,16 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ..core.config import get_settings
-from ..data.repository import get_repository
+from ..data.repository import BaseRepository, get_repository
 
 router = APIRouter()
-settings = get_settings()
-repository = get_repository()
+
+
+def get_repo() -> BaseRepository:
+    return get_repository()
 
 
 @router.get("/health")
@@ -20,11 +22,14 @@ def health() -> dict[str, str]:
 
 @router.get("/tickers")
 def tickers() -> list[str]:
-    return settings.load_tickers()
+    return get_settings().load_tickers()
 
 
 @router.get("/summary")
-def summary(date: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$")) -> list[dict]:
+def summary(
+    date: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    repository: BaseRepository = Depends(get_repo),
+) -> list[dict]:
     target_date = None
     if date:
         target_date = datetime.strptime(date, "%Y-%m-%d").date()
@@ -32,7 +37,11 @@ def summary(date: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$")) -
 
 
 @router.get("/symbol/{symbol}")
-def symbol_detail(symbol: str, limit: int = Query(60, ge=1, le=500)) -> list[dict]:
+def symbol_detail(
+    symbol: str,
+    limit: int = Query(60, ge=1, le=500),
+    repository: BaseRepository = Depends(get_repo),
+) -> list[dict]:
     data = repository.get_symbol(symbol.upper(), limit)
     if not data:
         raise HTTPException(status_code=404, detail="Symbol not found or no data")
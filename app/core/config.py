@@ -1,10 +1,11 @@
-import json
 import os
-from dataclasses import dataclass
-from functools import lru_cache
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,30 +19,43 @@ def _bool(value: str | None, default: bool = False) -> bool:
 
 @dataclass
 class Settings:
-    timezone: str = os.getenv("TZ", "Asia/Jakarta")
-    storage: str = os.getenv("STORAGE", "sqlite")
-    db_path: Path = Path(os.getenv("DB_PATH", "data/idx_quotes.db"))
-    csv_dir: Path = Path(os.getenv("CSV_DIR", "data"))
-    tickers_path: Path = Path(os.getenv("TICKERS_PATH", "config/tickers.json"))
-    rsi_min: float = float(os.getenv("RSI_MIN", "55"))
-    high_lookback: int = int(os.getenv("HIGH_LOOKBACK", "30"))
-    high_within_days: int = int(os.getenv("HIGH_WITHIN_DAYS", "5"))
-    fetch_interval_min: int = int(os.getenv("FETCH_INTERVAL_MIN", "60"))
-    enable_scheduler: bool = _bool(os.getenv("ENABLE_SCHEDULER", "false"))
+    # Defaults are read when Settings() is built, not at import, so env changes
+    # made before get_settings() is first called (or after cache_clear) apply.
+    timezone: str = field(default_factory=lambda: os.getenv("TZ", "Asia/Jakarta"))
+    storage: str = field(default_factory=lambda: os.getenv("STORAGE", "sqlite"))
+    db_path: Path = field(default_factory=lambda: Path(os.getenv("DB_PATH", "data/idx_quotes.db")))
+    sqlite_readers: int = field(default_factory=lambda: int(os.getenv("SQLITE_READERS", "4")))
+    csv_dir: Path = field(default_factory=lambda: Path(os.getenv("CSV_DIR", "data")))
+    parquet_dir: Path = field(default_factory=lambda: Path(os.getenv("PARQUET_DIR", "data/parquet")))
+    tickers_path: Path = field(default_factory=lambda: Path(os.getenv("TICKERS_PATH", "config/tickers.json")))
+    rsi_min: float = field(default_factory=lambda: float(os.getenv("RSI_MIN", "55")))
+    high_lookback: int = field(default_factory=lambda: int(os.getenv("HIGH_LOOKBACK", "30")))
+    high_within_days: int = field(default_factory=lambda: int(os.getenv("HIGH_WITHIN_DAYS", "5")))
+    fetch_interval_min: int = field(default_factory=lambda: int(os.getenv("FETCH_INTERVAL_MIN", "60")))
+    enable_scheduler: bool = field(default_factory=lambda: _bool(os.getenv("ENABLE_SCHEDULER", "false")))
+    _tickers_cache: Optional[Tuple[int, List[str]]] = field(default=None, init=False, repr=False, compare=False)
+
+    @cached_property
+    def tzinfo(self) -> ZoneInfo:
+        return ZoneInfo(self.timezone)
 
     def load_tickers(self) -> List[str]:
-        if not self.tickers_path.exists():
-            raise FileNotFoundError(f"Tickers file not found: {self.tickers_path}")
-        with self.tickers_path.open("r", encoding="utf-8") as f:
-            tickers = json.load(f)
-        if not isinstance(tickers, list):
-            raise ValueError("Tickers file must contain a JSON array")
-        return [str(t).upper() for t in tickers]
+        try:
+            mtime = self.tickers_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Tickers file not found: {self.tickers_path}") from None
+        # Re-parse only when the file changes on disk.
+        if self._tickers_cache is None or self._tickers_cache[0] != mtime:
+            tickers = orjson.loads(self.tickers_path.read_bytes())
+            if not isinstance(tickers, list):
+                raise ValueError("Tickers file must contain a JSON array")
+            self._tickers_cache = (mtime, [str(t).upper() for t in tickers])
+        return list(self._tickers_cache[1])
 
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     settings = Settings()
-    if settings.storage not in {"sqlite", "csv"}:
-        raise ValueError("STORAGE must be either 'sqlite' or 'csv'")
+    if settings.storage not in {"sqlite", "csv", "parquet"}:
+        raise ValueError("STORAGE must be one of 'sqlite', 'csv' or 'parquet'")
     return settings
@@ -1,6 +1,7 @@
 import json
 import logging
 import sys
+import threading
 from datetime import datetime, timezone
 from typing import Any, Dict
 
@@ -47,10 +48,16 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(log_record, ensure_ascii=False)
 
 
+_CONFIGURE_LOCK = threading.Lock()
+
+
 def configure_logging(level: int = logging.INFO) -> None:
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(JsonFormatter())
     root = logging.getLogger()
-    root.setLevel(level)
-    root.handlers.clear()
-    root.addHandler(handler)
+    # Swap handlers atomically so concurrent callers cannot both append one
+    # and duplicate every log line.
+    with _CONFIGURE_LOCK:
+        root.setLevel(level)
+        root.handlers.clear()
+        root.addHandler(handler)
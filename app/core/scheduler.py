@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import logging
-from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
@@ -15,11 +14,12 @@ class SchedulerService:
     def __init__(self) -> None:
         self.scheduler: AsyncIOScheduler | None = None
 
-    def start(self, job_func) -> None:
+    def start(self, job_func, compact_func=None) -> None:
         settings = get_settings()
-        tz = ZoneInfo(settings.timezone)
+        tz = settings.tzinfo
         scheduler = AsyncIOScheduler(timezone=tz)
-        trigger = CronTrigger(minute=5, timezone=tz)
+        # IDX trades 09:00-16:00 WIB on weekdays; the 16:05 run picks up the close.
+        trigger = CronTrigger(day_of_week="mon-fri", hour="9-16", minute=5, timezone=tz)
         scheduler.add_job(
             job_func,
             trigger,
@@ -28,6 +28,16 @@ class SchedulerService:
             misfire_grace_time=900,
             coalesce=True,
         )
+        if compact_func is not None:
+            # Fold the day's appended rows/parts together once the closing run is in.
+            scheduler.add_job(
+                compact_func,
+                CronTrigger(day_of_week="mon-fri", hour=16, minute=30, timezone=tz),
+                id="daily-compact",
+                max_instances=1,
+                misfire_grace_time=3600,
+                coalesce=True,
+            )
         scheduler.start()
         self.scheduler = scheduler
         logger.info("Scheduler started", extra={"timezone": settings.timezone})
@@ -38,14 +48,14 @@ class SchedulerService:
             logger.info("Scheduler stopped")
 
 
-def setup_scheduler(app, job_func) -> SchedulerService | None:
+def setup_scheduler(app, job_func, compact_func=None) -> SchedulerService | None:
     settings = get_settings()
     if not settings.enable_scheduler:
         logger.info("Scheduler disabled")
         return None
 
     service = SchedulerService()
-    service.start(job_func)
+    service.start(job_func, compact_func)
 
     @app.on_event("shutdown")
     async def _shutdown_scheduler() -> None:
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
+from typing import Dict, Iterable, Iterator, Tuple
+
+import numpy as np
 
 
 def to_timestamp(dt: datetime) -> int:
     return int(dt.timestamp())
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PriceRow:
     symbol: str
     ts_utc: int
@@ -19,7 +22,46 @@ class PriceRow:
     volume: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class PriceBatch:
+    """Column-oriented candles: one equal-length numpy array per PriceRow field."""
+
+    symbol: np.ndarray
+    ts_utc: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts_utc)
+
+    @classmethod
+    def empty(cls) -> "PriceBatch":
+        return cls(
+            np.empty(0, dtype=object),
+            np.empty(0, dtype=np.int64),
+            *(np.empty(0, dtype=np.float64) for _ in range(5)),
+        )
+
+    @classmethod
+    def concat(cls, batches: Iterable["PriceBatch"]) -> "PriceBatch":
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        return cls(*(np.concatenate([getattr(b, f.name) for b in batches]) for f in fields(cls)))
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def tuples(self) -> Iterator[Tuple]:
+        return zip(*(getattr(self, f.name).tolist() for f in fields(self)))
+
+
+@dataclass(frozen=True, slots=True)
 class IndicatorRow:
     symbol: str
     ts_utc: int
@@ -31,7 +73,7 @@ class IndicatorRow:
     updated_at_utc: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SummaryRow:
     symbol: str
     last_close: float | None
@@ -1,177 +1,433 @@
 from __future__ import annotations
 
+import heapq
 import logging
+import queue
+import shutil
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import asdict
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, timedelta, timezone, tzinfo
+from functools import lru_cache, partial
+from operator import attrgetter
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from zoneinfo import ZoneInfo
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 from ..core.config import get_settings
-from .models import IndicatorRow, PriceRow
+from .models import IndicatorRow, PriceBatch, PriceRow
 
 logger = logging.getLogger(__name__)
 
+PRICE_COLUMNS = ["symbol", "ts_utc", "open", "high", "low", "close", "volume"]
+INDICATOR_COLUMNS = ["symbol", "ts_utc", "ma20", "ma50", "rsi14", "is_30d_high", "signal", "updated_at_utc"]
+
+_SUMMARY_COLUMNS = [
+    "symbol",
+    "last_close",
+    "pct_change_1d",
+    "ma20",
+    "ma50",
+    "rsi14",
+    "is_30d_high",
+    "signal",
+    "updated_wib",
+]
+
+_price_values = attrgetter(*PRICE_COLUMNS)
+_indicator_values = attrgetter(*INDICATOR_COLUMNS)
+
+_PRICE_TYPES = {
+    "symbol": pa.string(),
+    "ts_utc": pa.int64(),
+    "open": pa.float64(),
+    "high": pa.float64(),
+    "low": pa.float64(),
+    "close": pa.float64(),
+    "volume": pa.float64(),
+}
+_INDICATOR_TYPES = {
+    "symbol": pa.string(),
+    "ts_utc": pa.int64(),
+    "ma20": pa.float64(),
+    "ma50": pa.float64(),
+    "rsi14": pa.float64(),
+    "is_30d_high": pa.int64(),
+    "signal": pa.int64(),
+    "updated_at_utc": pa.int64(),
+}
+
+_WRITTEN_COL = "_written_ns"
+# Parquet parts are always written with these schemas; inferring types per batch
+# would let an all-None column land as Arrow null and break reads of the store.
+_PRICE_SCHEMA = pa.schema(list(_PRICE_TYPES.items()))
+_INDICATOR_SCHEMA = pa.schema(list(_INDICATOR_TYPES.items()))
+_SYMBOL_PARTITIONING = ds.partitioning(pa.schema([("symbol", pa.string())]), flavor="hive")
+
+
+def _utc_offset(tz: tzinfo, ts: int) -> int:
+    return int(datetime.fromtimestamp(ts, tz=tz).utcoffset().total_seconds())
+
+
+@lru_cache(maxsize=4096)
+def _format_local(ts: int, tz: tzinfo) -> str:
+    # Summary rows mostly share a handful of candle timestamps.
+    return datetime.fromtimestamp(ts, tz=tz).strftime("%Y-%m-%d %H:%M")
+
+
+def _numeric_key(field: str) -> Callable[[dict], tuple]:
+    def key(row: dict) -> tuple:
+        value = row.get(field)
+        return (value is None, float(value) if value is not None else 0.0)
+
+    return key
+
+
+def _text_key(field: str) -> Callable[[dict], tuple]:
+    def key(row: dict) -> tuple:
+        value = row.get(field)
+        return (value is None, value or "")
+
+    return key
+
+
+# The sortable summary fields, and the only values accepted for ``sort``. Each
+# maps to the row key used by the file backends and the equivalent SQL
+# expression over the ``filtered`` CTE. Missing values sort last in ascending
+# order; ties keep symbol order.
+SUMMARY_SORT_KEYS: dict[str, Tuple[Callable[[dict], tuple], str]] = {
+    "symbol": (_text_key("symbol"), "symbol"),
+    "last_close": (_numeric_key("last_close"), "close"),
+    "pct_change_1d": (_numeric_key("pct_change_1d"), "pct_change_1d"),
+    "ma20": (_numeric_key("ma20"), "ma20"),
+    "ma50": (_numeric_key("ma50"), "ma50"),
+    "rsi14": (_numeric_key("rsi14"), "rsi14"),
+    "is_30d_high": (_numeric_key("is_30d_high"), "COALESCE(is_30d_high, 0) != 0"),
+    "signal": (_numeric_key("signal"), "COALESCE(signal, 0) != 0"),
+    "updated_wib": (_text_key("updated_wib"), "(updated_at_utc + :utc_offset) / 60"),
+}
+
+
+# Symbols are stored upper-case, so the search needle is upper-cased once and
+# matched before aggregating instead of folding every stored symbol.
+_SUMMARY_SQL = """
+WITH latest_price AS (
+    SELECT symbol, MAX(ts_utc) AS ts_utc
+    FROM prices
+    WHERE (:end_utc IS NULL OR ts_utc <= :end_utc) AND instr(symbol, :search) > 0
+    GROUP BY symbol
+), latest_indicator AS (
+    SELECT i.* FROM indicators i
+    INNER JOIN (
+        SELECT symbol, MAX(ts_utc) AS ts_utc
+        FROM indicators
+        WHERE (:end_utc IS NULL OR ts_utc <= :end_utc)
+        GROUP BY symbol
+    ) latest ON latest.symbol = i.symbol AND latest.ts_utc = i.ts_utc
+), summary AS (
+    SELECT p.symbol,
+           p.close,
+           p.ts_utc,
+           (
+               SELECT prev.close FROM prices prev
+               WHERE prev.symbol = p.symbol
+                 AND prev.ts_utc < p.ts_utc - ((p.ts_utc + :utc_offset) % 86400)
+               ORDER BY prev.ts_utc DESC
+               LIMIT 1
+           ) AS prev_close,
+           li.ma20,
+           li.ma50,
+           li.rsi14,
+           li.is_30d_high,
+           li.signal,
+           COALESCE(li.updated_at_utc, p.ts_utc) AS updated_at_utc
+    FROM latest_price lp
+    JOIN prices p ON p.symbol = lp.symbol AND p.ts_utc = lp.ts_utc
+    LEFT JOIN latest_indicator li ON li.symbol = p.symbol
+)
+"""
+
+_SUMMARY_FILTER_SQL = """
+, filtered AS (
+    SELECT *, CASE WHEN prev_close THEN (close - prev_close) / prev_close * 100 END AS pct_change_1d
+    FROM summary
+)
+"""
+
 
 class BaseRepository:
-    def upsert_prices(self, rows: Iterable[PriceRow]) -> None:  # pragma: no cover - interface
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group several writes so they are committed together."""
+        yield
+
+    def upsert_prices(self, rows: Iterable[PriceRow] | PriceBatch) -> None:  # pragma: no cover - interface
         raise NotImplementedError
 
     def upsert_indicators(self, rows: Iterable[IndicatorRow]) -> None:  # pragma: no cover - interface
         raise NotImplementedError
 
     def get_latest_summary(self, target_date: Optional[date]) -> List[dict]:  # pragma: no cover - interface
+        """Latest row per symbol, in ascending symbol order."""
         raise NotImplementedError
 
+    def get_summary_page(
+        self, search: str, sort: str, descending: bool, offset: int, limit: int
+    ) -> Tuple[List[dict], int]:
+        """Return one page of the latest summary plus the number of matching symbols."""
+        rows = self.get_latest_summary(None)
+        if search:
+            needle = search.upper()
+            rows = [row for row in rows if needle in row["symbol"].upper()]
+        total = len(rows)
+        end = offset + limit
+        if sort == "symbol" and not descending:
+            return rows[offset:end], total
+        key = SUMMARY_SORT_KEYS[sort][0]
+        if end <= total // 4:
+            # Early pages only need the first ``end`` rows, so a heap selection
+            # beats sorting everything.
+            select = heapq.nlargest if descending else heapq.nsmallest
+            return select(end, rows, key=key)[offset:], total
+        rows.sort(key=key, reverse=descending)
+        return rows[offset:end], total
+
     def get_symbol(self, symbol: str, limit: int) -> List[dict]:  # pragma: no cover - interface
         raise NotImplementedError
 
     def load_prices(self, days: Optional[int] = None) -> pd.DataFrame:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def compact(self) -> None:
+        """Merge incremental storage files; a no-op for backends that write in place."""
 
-class SQLiteRepository(BaseRepository):
-    def __init__(self, db_path: Path) -> None:
+
+class SQLitePool:
+    """One writer connection plus a fixed set of ``query_only`` reader connections.
+
+    WAL journaling lets the readers run alongside the writer, so API requests
+    are not serialized behind ingestion or behind each other.
+    """
+
+    def __init__(self, db_path: Path, readers: int = 4) -> None:
         db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self.writer = self._connect(db_path)
+        # page_size only takes effect on a fresh file and must precede WAL mode.
+        self.writer.execute("PRAGMA page_size=8192")
+        self.writer.execute("PRAGMA journal_mode=WAL")
         schema_path = Path(__file__).parent / "schema.sql"
         with schema_path.open("r", encoding="utf-8") as f:
-            self.conn.executescript(f.read())
-        self.conn.commit()
-
-    def upsert_prices(self, rows: Iterable[PriceRow]) -> None:
-        data = [
-            (r.symbol, r.ts_utc, r.open, r.high, r.low, r.close, r.volume)
-            for r in rows
-        ]
-        if not data:
+            self.writer.executescript(f.read())
+        self.writer.commit()
+        self.write_lock = threading.RLock()
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+        for _ in range(max(1, readers)):
+            conn = self._connect(db_path)
+            conn.execute("PRAGMA query_only=ON")
+            self._readers.put(conn)
+
+    @staticmethod
+    def _connect(db_path: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=1073741824")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def acquire_read(self) -> Iterator[sqlite3.Connection]:
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+
+class SQLiteRepository(BaseRepository):
+    def __init__(self, db_path: Path, readers: int = 4) -> None:
+        self.db_path = db_path
+        self.pool = SQLitePool(db_path, readers=readers)
+        self._local = threading.local()
+
+    @property
+    def _in_transaction(self) -> bool:
+        return getattr(self._local, "in_transaction", False)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        if self._in_transaction:
+            yield
+            return
+        with self.pool.write_lock:
+            self._local.in_transaction = True
+            try:
+                with self.pool.writer:
+                    yield
+            finally:
+                self._local.in_transaction = False
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        if self._in_transaction:
+            yield self.pool.writer
             return
-        with self.conn:
-            self.conn.executemany(
+        with self.pool.write_lock, self.pool.writer:
+            yield self.pool.writer
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        # Inside a transaction, read through the writer to see its pending rows.
+        if self._in_transaction:
+            yield self.pool.writer
+            return
+        with self.pool.acquire_read() as conn:
+            yield conn
+
+    def upsert_prices(self, rows: Iterable[PriceRow] | PriceBatch) -> None:
+        values = rows.tuples() if isinstance(rows, PriceBatch) else map(_price_values, rows)
+        with self._write() as conn:
+            conn.executemany(
                 """
                 INSERT OR REPLACE INTO prices(symbol, ts_utc, open, high, low, close, volume)
                 VALUES(?,?,?,?,?,?,?)
                 """,
-                data,
+                values,
             )
 
     def upsert_indicators(self, rows: Iterable[IndicatorRow]) -> None:
-        data = [
-            (
-                r.symbol,
-                r.ts_utc,
-                r.ma20,
-                r.ma50,
-                r.rsi14,
-                r.is_30d_high,
-                r.signal,
-                r.updated_at_utc,
-            )
-            for r in rows
-        ]
-        if not data:
-            return
-        with self.conn:
-            self.conn.executemany(
+        with self._write() as conn:
+            conn.executemany(
                 """
                 INSERT OR REPLACE INTO indicators(symbol, ts_utc, ma20, ma50, rsi14, is_30d_high, signal, updated_at_utc)
                 VALUES(?,?,?,?,?,?,?,?)
                 """,
-                data,
+                map(_indicator_values, rows),
             )
 
-    def get_latest_summary(self, target_date: Optional[date]) -> List[dict]:
-        params: dict[str, int | None] = {"end_utc": None}
-        end_utc = None
+    def _summary_params(self, target_date: Optional[date]) -> Tuple[dict, tzinfo]:
+        tz = get_settings().tzinfo
+        reference = datetime.now(tz)
+        params: dict[str, int | str | None] = {"end_utc": None, "search": ""}
         if target_date:
-            settings = get_settings()
-            tz = ZoneInfo(settings.timezone)
             end_dt = datetime.combine(target_date, datetime.max.time()).replace(tzinfo=tz)
-            end_utc = int(end_dt.timestamp())
-            params["end_utc"] = end_utc
-        sql = """
-        WITH latest_price AS (
-            SELECT symbol, MAX(ts_utc) AS ts_utc
-            FROM prices
-            WHERE (:end_utc IS NULL OR ts_utc <= :end_utc)
-            GROUP BY symbol
-        ), latest_indicator AS (
-            SELECT i.* FROM indicators i
-            INNER JOIN (
-                SELECT symbol, MAX(ts_utc) AS ts_utc
-                FROM indicators
-                WHERE (:end_utc IS NULL OR ts_utc <= :end_utc)
-                GROUP BY symbol
-            ) latest ON latest.symbol = i.symbol AND latest.ts_utc = i.ts_utc
-        )
-        SELECT p.symbol,
-               p.close,
-               p.ts_utc,
-               li.ma20,
-               li.ma50,
-               li.rsi14,
-               li.is_30d_high,
-               li.signal,
-               COALESCE(li.updated_at_utc, p.ts_utc) AS updated_at_utc
-        FROM latest_price lp
-        JOIN prices p ON p.symbol = lp.symbol AND p.ts_utc = lp.ts_utc
-        LEFT JOIN latest_indicator li ON li.symbol = p.symbol
-        ORDER BY p.symbol
+            params["end_utc"] = int(end_dt.timestamp())
+            reference = end_dt
+        # Local midnight of each symbol's latest candle is derived in SQL from the
+        # zone's UTC offset so the previous close comes back in the same query.
+        params["utc_offset"] = _utc_offset(tz, int(reference.timestamp()))
+        return params, tz
+
+    @staticmethod
+    def _summary_dict(row: sqlite3.Row, tz: tzinfo) -> dict:
+        return {
+            "symbol": row["symbol"],
+            "last_close": row["close"],
+            "pct_change_1d": (row["close"] - row["prev_close"]) / row["prev_close"] * 100
+            if row["prev_close"]
+            else None,
+            "ma20": row["ma20"],
+            "ma50": row["ma50"],
+            "rsi14": row["rsi14"],
+            "is_30d_high": bool(row["is_30d_high"]) if row["is_30d_high"] is not None else False,
+            "signal": bool(row["signal"]) if row["signal"] is not None else False,
+            "updated_wib": _format_local(row["updated_at_utc"], tz),
+        }
+
+    def get_latest_summary(self, target_date: Optional[date]) -> List[dict]:
+        params, tz = self._summary_params(target_date)
+        with self._read() as conn:
+            rows = conn.execute(_SUMMARY_SQL + "SELECT * FROM summary ORDER BY symbol", params).fetchall()
+        return [self._summary_dict(row, tz) for row in rows]
+
+    def get_summary_page(
+        self, search: str, sort: str, descending: bool, offset: int, limit: int
+    ) -> Tuple[List[dict], int]:
+        params, tz = self._summary_params(None)
+        params.update(search=search.upper(), offset=offset, limit=limit)
+        column = SUMMARY_SORT_KEYS[sort][1]
+        direction = "DESC" if descending else "ASC"
+        # Mirrors the row keys in SUMMARY_SORT_KEYS: NULLs last ascending, ties in symbol order.
+        sql = (
+            _SUMMARY_SQL
+            + _SUMMARY_FILTER_SQL
+            + f"""
+        SELECT *, COUNT(*) OVER () AS total FROM filtered
+        ORDER BY ({column}) IS NULL {direction}, {column} {direction}, symbol
+        LIMIT :limit OFFSET :offset
         """
-        cur = self.conn.execute(sql, params)
-        rows = []
-        settings = get_settings()
-        tz = ZoneInfo(settings.timezone)
-        for row in cur.fetchall():
-            updated = datetime.fromtimestamp(row["updated_at_utc"], tz=ZoneInfo("UTC")).astimezone(tz)
-            local_dt = datetime.fromtimestamp(row["ts_utc"], tz=ZoneInfo("UTC")).astimezone(tz)
-            start_local = datetime.combine(local_dt.date(), datetime.min.time(), tz)
-            start_utc = int(start_local.astimezone(ZoneInfo("UTC")).timestamp())
-            prev_cur = self.conn.execute(
-                "SELECT close FROM prices WHERE symbol = ? AND ts_utc < ? ORDER BY ts_utc DESC LIMIT 1",
-                (row["symbol"], start_utc),
-            )
-            prev_row = prev_cur.fetchone()
-            prev_close = prev_row[0] if prev_row else None
-            pct = None
-            if prev_close and prev_close != 0:
-                pct = (row["close"] - prev_close) / prev_close * 100
-            rows.append(
-                {
-                    "symbol": row["symbol"],
-                    "last_close": row["close"],
-                    "pct_change_1d": pct,
-                    "ma20": row["ma20"],
-                    "ma50": row["ma50"],
-                    "rsi14": row["rsi14"],
-                    "is_30d_high": bool(row["is_30d_high"]) if row["is_30d_high"] is not None else False,
-                    "signal": bool(row["signal"]) if row["signal"] is not None else False,
-                    "updated_wib": updated.strftime("%Y-%m-%d %H:%M"),
-                }
-            )
-        return rows
+        )
+        with self._read() as conn:
+            rows = conn.execute(sql, params).fetchall()
+            if rows:
+                total = rows[0]["total"]
+            else:
+                count_sql = _SUMMARY_SQL + _SUMMARY_FILTER_SQL + "SELECT COUNT(*) FROM filtered"
+                total = conn.execute(count_sql, params).fetchone()[0]
+        return [self._summary_dict(row, tz) for row in rows], total
 
     def get_symbol(self, symbol: str, limit: int) -> List[dict]:
+        # Prices and the indicator rows covering their window are merged into one
+        # time-ordered stream; a running count of indicator rows tags each price
+        # with the latest indicator at or before it, so alignment is a single pass.
         sql = """
-        SELECT p.symbol, p.ts_utc, p.open, p.high, p.low, p.close, p.volume,
-               i.ma20, i.ma50, i.rsi14, i.is_30d_high, i.signal
-        FROM prices p
-        LEFT JOIN indicators i ON i.symbol = p.symbol AND i.ts_utc = (
-            SELECT MAX(ts_utc) FROM indicators i2 WHERE i2.symbol = p.symbol AND i2.ts_utc <= p.ts_utc
+        WITH p AS (
+            SELECT ts_utc, open, high, low, close, volume
+            FROM prices
+            WHERE symbol = :symbol
+            ORDER BY ts_utc DESC
+            LIMIT :limit
+        ), i AS (
+            SELECT ts_utc, ma20, ma50, rsi14, is_30d_high, signal
+            FROM indicators
+            WHERE symbol = :symbol
+              AND ts_utc <= (SELECT MAX(ts_utc) FROM p)
+              AND ts_utc >= COALESCE(
+                  (
+                      SELECT MAX(ts_utc) FROM indicators
+                      WHERE symbol = :symbol AND ts_utc <= (SELECT MIN(ts_utc) FROM p)
+                  ),
+                  (SELECT MIN(ts_utc) FROM p)
+              )
+        ), events AS (
+            SELECT ts_utc, 1 AS is_price, open, high, low, close, volume,
+                   NULL AS ma20, NULL AS ma50, NULL AS rsi14, NULL AS is_30d_high, NULL AS signal
+            FROM p
+            UNION ALL
+            SELECT ts_utc, 0, NULL, NULL, NULL, NULL, NULL, ma20, ma50, rsi14, is_30d_high, signal
+            FROM i
+        ), tagged AS (
+            SELECT *, SUM(1 - is_price) OVER (ORDER BY ts_utc, is_price) AS grp
+            FROM events
+        ), aligned AS (
+            SELECT ts_utc, is_price, open, high, low, close, volume,
+                   MAX(ma20) OVER w AS ma20,
+                   MAX(ma50) OVER w AS ma50,
+                   MAX(rsi14) OVER w AS rsi14,
+                   MAX(is_30d_high) OVER w AS is_30d_high,
+                   MAX(signal) OVER w AS signal
+            FROM tagged
+            WINDOW w AS (PARTITION BY grp)
         )
-        WHERE p.symbol = ?
-        ORDER BY p.ts_utc DESC
-        LIMIT ?
+        SELECT :symbol AS symbol, ts_utc, open, high, low, close, volume,
+               ma20, ma50, rsi14, is_30d_high, signal
+        FROM aligned
+        WHERE is_price = 1
+        ORDER BY ts_utc DESC
         """
-        cur = self.conn.execute(sql, (symbol, limit))
-        rows = []
-        for row in cur.fetchall():
-            rows.append({k: row[k] for k in row.keys()})
-        return rows
+        with self._read() as conn:
+            return [dict(row) for row in conn.execute(sql, {"symbol": symbol, "limit": limit})]
 
     def load_prices(self, days: Optional[int] = None) -> pd.DataFrame:
         sql = "SELECT symbol, ts_utc, open, high, low, close, volume FROM prices"
@@ -180,121 +436,282 @@ class SQLiteRepository(BaseRepository):
             cutoff = int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
             sql += " WHERE ts_utc >= ?"
             params = (cutoff,)
-        df = pd.read_sql_query(sql, self.conn, params=params)
+        with self._read() as conn:
+            df = pd.read_sql_query(sql, conn, params=params)
         return df
 
 
 class CSVRepository(BaseRepository):
+    """Flat ``prices.csv`` / ``indicators.csv`` files.
+
+    Upserts append the new rows; duplicates are resolved on read by keeping the
+    row written last for each ``(symbol, ts_utc)``. :meth:`compact` rewrites the
+    files sorted and deduplicated.
+    """
+
     def __init__(self, directory: Path) -> None:
         self.dir = directory
         self.dir.mkdir(parents=True, exist_ok=True)
         self.prices_path = self.dir / "prices.csv"
         self.indicators_path = self.dir / "indicators.csv"
+        self.write_lock = threading.RLock()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        # Appends and compaction share one lock so a compaction never drops rows
+        # appended while it was rewriting the store.
+        with self.write_lock:
+            yield
 
     def _load_df(self, path: Path, columns: list[str]) -> pd.DataFrame:
-        if not path.exists():
+        try:
+            return pd.read_csv(path)
+        except FileNotFoundError:
             return pd.DataFrame(columns=columns)
-        return pd.read_csv(path)
 
-    def upsert_prices(self, rows: Iterable[PriceRow]) -> None:
-        records = [asdict(r) for r in rows]
-        if not records:
+    @staticmethod
+    def _read_csv(
+        path: Path, column_types: dict, symbol: Optional[str] = None, since: Optional[int] = None
+    ) -> Optional[pd.DataFrame]:
+        # Open directly instead of checking exists() first: one syscall fewer and
+        # no window for the file to disappear in between.
+        try:
+            table = pv.read_csv(path, convert_options=pv.ConvertOptions(column_types=column_types))
+        except FileNotFoundError:
+            return None
+        if symbol is not None:
+            table = table.filter(pc.equal(table["symbol"], symbol))
+        if since is not None:
+            table = table.filter(pc.greater_equal(table["ts_utc"], since))
+        return CSVRepository._dedup(table.to_pandas())
+
+    @staticmethod
+    def _dedup(df: pd.DataFrame) -> pd.DataFrame:
+        df = df.drop_duplicates(subset=["symbol", "ts_utc"], keep="last")
+        return df.sort_values(["symbol", "ts_utc"]).reset_index(drop=True)
+
+    @staticmethod
+    def _append_csv(path: Path, df: pd.DataFrame, columns: list[str]) -> None:
+        df[columns].to_csv(path, mode="a", header=not path.exists(), index=False)
+
+    @staticmethod
+    def _changed(df_new: pd.DataFrame, df_old: Optional[pd.DataFrame], columns: list[str]) -> pd.DataFrame:
+        # Every fetch re-downloads months of daily candles; appending only the rows
+        # whose values differ from what is stored keeps the file from growing by
+        # that whole window each cycle. NaN matches NaN in the merge.
+        if df_old is None or df_old.empty:
+            return df_new
+        df_old = df_old[columns].drop_duplicates()
+        keys = df_new[columns].astype(df_old.dtypes.to_dict())
+        merged = keys.merge(df_old, on=columns, how="left", indicator=True)
+        return df_new[(merged["_merge"] == "left_only").to_numpy()]
+
+    def _read_prices(self, symbol: Optional[str] = None, since: Optional[int] = None) -> Optional[pd.DataFrame]:
+        return self._read_csv(self.prices_path, _PRICE_TYPES, symbol=symbol, since=since)
+
+    def _read_indicators(self, symbol: Optional[str] = None) -> Optional[pd.DataFrame]:
+        return self._read_csv(self.indicators_path, _INDICATOR_TYPES, symbol=symbol)
+
+    def upsert_prices(self, rows: Iterable[PriceRow] | PriceBatch) -> None:
+        if isinstance(rows, PriceBatch):
+            df_new = pd.DataFrame(rows.columns())
+        else:
+            df_new = pd.DataFrame([asdict(r) for r in rows])
+        if df_new.empty:
             return
-        df_new = pd.DataFrame(records)
-        df = self._load_df(self.prices_path, list(df_new.columns))
-        combined = pd.concat([df, df_new], ignore_index=True)
-        combined.sort_values(["symbol", "ts_utc"], inplace=True)
-        combined.drop_duplicates(subset=["symbol", "ts_utc"], keep="last", inplace=True)
-        combined.to_csv(self.prices_path, index=False)
+        with self.write_lock:
+            df_old = self._read_prices(since=int(df_new["ts_utc"].min()))
+            df_new = self._changed(df_new, df_old, PRICE_COLUMNS)
+            if not df_new.empty:
+                self._append_csv(self.prices_path, df_new, PRICE_COLUMNS)
 
     def upsert_indicators(self, rows: Iterable[IndicatorRow]) -> None:
         records = [asdict(r) for r in rows]
         if not records:
             return
         df_new = pd.DataFrame(records)
-        df = self._load_df(self.indicators_path, list(df_new.columns))
-        combined = pd.concat([df, df_new], ignore_index=True)
-        combined.sort_values(["symbol", "ts_utc"], inplace=True)
-        combined.drop_duplicates(subset=["symbol", "ts_utc"], keep="last", inplace=True)
-        combined.to_csv(self.indicators_path, index=False)
+        with self.write_lock:
+            # updated_at_utc changes on every recompute, so it does not count as a change.
+            df_new = self._changed(df_new, self._read_indicators(), INDICATOR_COLUMNS[:-1])
+            if not df_new.empty:
+                self._append_csv(self.indicators_path, df_new, INDICATOR_COLUMNS)
+
+    def compact(self) -> None:
+        for path, columns in ((self.prices_path, PRICE_COLUMNS), (self.indicators_path, INDICATOR_COLUMNS)):
+            with self.write_lock:
+                if not path.exists():
+                    continue
+                df = self._dedup(self._load_df(path, columns))
+                staging = path.with_name(f"{path.name}.compact")
+                df[columns].to_csv(staging, index=False)
+                staging.replace(path)
+            logger.info("Compacted CSV store", extra={"path": str(path), "rows": len(df)})
 
     def get_latest_summary(self, target_date: Optional[date]) -> List[dict]:
-        if not self.prices_path.exists():
-            return []
-        df_prices = pd.read_csv(self.prices_path)
-        if df_prices.empty:
+        df_prices = self._read_prices()
+        if df_prices is None or df_prices.empty:
             return []
+        settings = get_settings()
+        tz = settings.tzinfo
         df_prices.sort_values(["symbol", "ts_utc"], inplace=True)
         if target_date:
-            settings = get_settings()
-            tz = ZoneInfo(settings.timezone)
             end_dt = datetime.combine(target_date, datetime.max.time()).replace(tzinfo=tz)
             end_utc = int(end_dt.timestamp())
             df_prices = df_prices[df_prices["ts_utc"] <= end_utc]
         latest = df_prices.groupby("symbol").tail(1).copy()
         latest.rename(columns={"close": "last_close"}, inplace=True)
-        if self.indicators_path.exists():
-            df_ind = pd.read_csv(self.indicators_path)
+        # Previous close is the last close of the symbol's prior local trading day.
+        # Bucket candles into local days with the zone's current UTC offset rather
+        # than a per-row tz conversion (same approach as the SQLite summary).
+        offset = _utc_offset(tz, int(df_prices["ts_utc"].max())) if not df_prices.empty else 0
+        local_day = (df_prices["ts_utc"] + offset) // 86400
+        daily_close = df_prices.groupby(["symbol", local_day.rename("day")])["close"].last()
+        prev_close = daily_close.groupby(level="symbol").shift(1).groupby(level="symbol").tail(1).droplevel("day")
+        latest["prev_close"] = latest["symbol"].map(prev_close)
+        df_ind = self._read_indicators()
+        if df_ind is not None:
             if target_date:
                 df_ind = df_ind[df_ind["ts_utc"] <= end_utc]
             df_ind.sort_values(["symbol", "ts_utc"], inplace=True)
             df_ind = df_ind.groupby("symbol").tail(1)
             latest = latest.merge(df_ind, on=["symbol", "ts_utc"], how="left")
-        settings = get_settings()
-        tz = ZoneInfo(settings.timezone)
-        rows: List[dict] = []
-        for _, row in latest.iterrows():
-            symbol = row["symbol"]
-            symbol_df = df_prices[df_prices["symbol"] == symbol]
-            local_dt = datetime.fromtimestamp(row["ts_utc"], tz=ZoneInfo("UTC")).astimezone(tz)
-            start_local = datetime.combine(local_dt.date(), datetime.min.time(), tz)
-            start_utc = int(start_local.astimezone(ZoneInfo("UTC")).timestamp())
-            prev_df = symbol_df[symbol_df["ts_utc"] < start_utc].tail(1)
-            prev_close = prev_df["close"].iloc[0] if not prev_df.empty else None
-            pct = None
-            if pd.notna(prev_close) and prev_close:
-                pct = (row["last_close"] - prev_close) / prev_close * 100
-            updated = datetime.fromtimestamp(row["ts_utc"], tz=ZoneInfo("UTC")).astimezone(tz)
-            rows.append(
-                {
-                    "symbol": row["symbol"],
-                    "last_close": row["last_close"],
-                    "pct_change_1d": pct,
-                    "ma20": row.get("ma20"),
-                    "ma50": row.get("ma50"),
-                    "rsi14": row.get("rsi14"),
-                    "is_30d_high": bool(row.get("is_30d_high", 0)),
-                    "signal": bool(row.get("signal", 0)),
-                    "updated_wib": updated.strftime("%Y-%m-%d %H:%M"),
-                }
-            )
-        return rows
+        for column in ("ma20", "ma50", "rsi14", "is_30d_high", "signal"):
+            if column not in latest.columns:
+                latest[column] = np.nan
+        prev = latest["prev_close"]
+        latest["pct_change_1d"] = ((latest["last_close"] - prev) / prev * 100).where(prev.notna() & prev.ne(0))
+        latest["is_30d_high"] = latest["is_30d_high"].fillna(0).astype(bool)
+        latest["signal"] = latest["signal"].fillna(0).astype(bool)
+        latest["updated_wib"] = latest["ts_utc"].map(partial(_format_local, tz=tz))
+        summary = latest[_SUMMARY_COLUMNS].astype(object)
+        return summary.where(summary.notna(), None).to_dict(orient="records")
 
     def get_symbol(self, symbol: str, limit: int) -> List[dict]:
-        if not self.prices_path.exists():
+        df_prices = self._read_prices(symbol=symbol)
+        if df_prices is None:
             return []
-        df_prices = pd.read_csv(self.prices_path)
-        df_prices = df_prices[df_prices["symbol"] == symbol].sort_values("ts_utc", ascending=False)
+        df_prices = df_prices.sort_values("ts_utc", ascending=False)
         df_prices = df_prices.head(limit)
-        if self.indicators_path.exists():
-            df_ind = pd.read_csv(self.indicators_path)
-            df_ind = df_ind[df_ind["symbol"] == symbol]
+        df_ind = self._read_indicators(symbol=symbol)
+        if df_ind is not None:
             df_ind = df_ind.sort_values("ts_utc")
             df_prices = df_prices.merge(df_ind, on=["symbol", "ts_utc"], how="left")
         return df_prices.to_dict(orient="records")
 
     def load_prices(self, days: Optional[int] = None) -> pd.DataFrame:
-        if not self.prices_path.exists():
-            return pd.DataFrame(columns=["symbol", "ts_utc", "open", "high", "low", "close", "volume"])
-        df = pd.read_csv(self.prices_path)
-        if days is not None and not df.empty:
+        cutoff = None
+        if days is not None:
             cutoff = int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
-            df = df[df["ts_utc"] >= cutoff]
+        df = self._read_prices(since=cutoff)
+        if df is None:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
         return df
 
 
+class ParquetRepository(CSVRepository):
+    """Append-only store partitioned by symbol (``prices/symbol=XYZ/part-*.parquet``).
+
+    Upserts only write the new rows; duplicates are resolved on read by keeping
+    the most recently written row per ``(symbol, ts_utc)``. :meth:`compact`
+    (run by the scheduler after each trading day) folds the small part files
+    back together.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.dir = directory
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.prices_root = self.dir / "prices"
+        self.indicators_root = self.dir / "indicators"
+        self.write_lock = threading.RLock()
+
+    def _append(self, root: Path, table: pa.Table) -> None:
+        written_ns = time.time_ns()
+        table = table.append_column(_WRITTEN_COL, pa.array([written_ns] * table.num_rows, pa.int64()))
+        pq.write_to_dataset(
+            table,
+            root_path=str(root),
+            partition_cols=["symbol"],
+            basename_template=f"part-{written_ns}-{{i}}.parquet",
+        )
+
+    @staticmethod
+    def _dataset(root: Path, schema: pa.Schema) -> ds.Dataset:
+        return ds.dataset(
+            str(root),
+            schema=schema.append(pa.field(_WRITTEN_COL, pa.int64())),
+            format="parquet",
+            partitioning=_SYMBOL_PARTITIONING,
+        )
+
+    def _scan(self, root: Path, schema: pa.Schema, filter_expr=None) -> Optional[pd.DataFrame]:
+        if not root.exists():
+            return None
+        try:
+            table = self._dataset(root, schema).to_table(filter=filter_expr)
+        except FileNotFoundError:
+            # A compaction removed parts after they were listed; its replacements
+            # are already in place, so listing again sees a complete store.
+            table = self._dataset(root, schema).to_table(filter=filter_expr)
+        return self._latest(table.to_pandas(), schema)
+
+    @staticmethod
+    def _latest(df: pd.DataFrame, schema: pa.Schema) -> pd.DataFrame:
+        df.sort_values(["symbol", "ts_utc", _WRITTEN_COL], inplace=True)
+        df.drop_duplicates(subset=["symbol", "ts_utc"], keep="last", inplace=True)
+        return df[schema.names].reset_index(drop=True)
+
+    def upsert_prices(self, rows: Iterable[PriceRow] | PriceBatch) -> None:
+        if isinstance(rows, PriceBatch):
+            table = pa.table(rows.columns(), schema=_PRICE_SCHEMA)
+        else:
+            table = pa.Table.from_pylist([asdict(r) for r in rows], schema=_PRICE_SCHEMA)
+        if table.num_rows:
+            with self.write_lock:
+                self._append(self.prices_root, table)
+
+    def upsert_indicators(self, rows: Iterable[IndicatorRow]) -> None:
+        records = [asdict(r) for r in rows]
+        if records:
+            table = pa.Table.from_pylist(records, schema=_INDICATOR_SCHEMA)
+            with self.write_lock:
+                self._append(self.indicators_root, table)
+
+    def _read_prices(self, symbol: Optional[str] = None, since: Optional[int] = None) -> Optional[pd.DataFrame]:
+        filter_expr = None
+        if symbol is not None:
+            filter_expr = ds.field("symbol") == symbol
+        if since is not None:
+            since_expr = ds.field("ts_utc") >= since
+            filter_expr = since_expr if filter_expr is None else filter_expr & since_expr
+        return self._scan(self.prices_root, _PRICE_SCHEMA, filter_expr)
+
+    def _read_indicators(self, symbol: Optional[str] = None) -> Optional[pd.DataFrame]:
+        filter_expr = ds.field("symbol") == symbol if symbol is not None else None
+        return self._scan(self.indicators_root, _INDICATOR_SCHEMA, filter_expr)
+
+    def compact(self) -> None:
+        for root, schema in ((self.prices_root, _PRICE_SCHEMA), (self.indicators_root, _INDICATOR_SCHEMA)):
+            with self.write_lock:
+                if not root.exists():
+                    continue
+                dataset = self._dataset(root, schema)
+                df = self._latest(dataset.to_table().to_pandas(), schema)
+                # Write the merged parts next to the old ones, then delete only the
+                # parts that were scanned. The newer merged rows win on read in the
+                # meantime, so readers never see a missing or half-written store.
+                if not df.empty:
+                    self._append(root, pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+                for part in dataset.files:
+                    Path(part).unlink()
+            logger.info("Compacted parquet store", extra={"path": str(root), "rows": len(df)})
+
+
+@lru_cache(maxsize=1)
 def get_repository() -> BaseRepository:
+    """Return the process-wide repository shared by the API and ingestion jobs."""
     settings = get_settings()
     if settings.storage == "sqlite":
-        return SQLiteRepository(settings.db_path)
+        return SQLiteRepository(settings.db_path, readers=settings.sqlite_readers)
+    if settings.storage == "parquet":
+        return ParquetRepository(settings.parquet_dir)
     return CSVRepository(settings.csv_dir)
@@ -10,6 +10,7 @@ CREATE TABLE IF NOT EXISTS prices (
 );
 
 CREATE INDEX IF NOT EXISTS idx_prices_symbol_ts ON prices(symbol, ts_utc DESC);
+CREATE INDEX IF NOT EXISTS idx_prices_ts ON prices(ts_utc);
 
 CREATE TABLE IF NOT EXISTS indicators (
     symbol TEXT NOT NULL,
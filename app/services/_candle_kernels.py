@@ -0,0 +1,29 @@
+"""Numba kernel backing :func:`app.services.fetcher._parse_chart`.
+
+The chart payload arrives as float64 columns where JSON nulls are NaN.
+``_filter_candles`` drops incomplete and future candles in a single pass,
+compacting the survivors into the front of caller-provided output arrays
+and returning how many were kept.
+"""
+from __future__ import annotations
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _filter_candles(ts, o, h, l, c, v, now_ts, out_ts, out_o, out_h, out_l, out_c, out_v):
+    count = 0
+    for i in range(ts.shape[0]):
+        if np.isnan(ts[i]) or ts[i] > now_ts:
+            continue
+        if np.isnan(o[i]) or np.isnan(h[i]) or np.isnan(l[i]) or np.isnan(c[i]):
+            continue
+        out_ts[count] = np.int64(ts[i])
+        out_o[count] = o[i]
+        out_h[count] = h[i]
+        out_l[count] = l[i]
+        out_c[count] = c[i]
+        out_v[count] = 0.0 if np.isnan(v[i]) else v[i]
+        count += 1
+    return count
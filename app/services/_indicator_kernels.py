@@ -0,0 +1,78 @@
+"""Numba kernels backing :func:`app.services.indicators.compute_indicators`.
+
+Each kernel walks a contiguous float64 close array holding every symbol's
+series back to back. ``bounds`` lists the start offset of each symbol plus
+the total length, so a single call covers the whole universe.
+``_price_indicators`` fills both moving averages, the RSI and the rolling
+high in one pass. Results are written into caller-provided arrays and match
+the pandas reference implementations in :mod:`app.services.indicators`
+applied per symbol.
+"""
+from __future__ import annotations
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def _price_indicators(close, bounds, short, long, rsi_n, high_n, ma_short, ma_long, rsi, high):
+    alpha = 1.0 / rsi_n
+    window = np.empty(close.shape[0], dtype=np.int64)
+    for g in range(bounds.shape[0] - 1):
+        start = bounds[g]
+        end = bounds[g + 1]
+        sum_short = 0.0
+        sum_long = 0.0
+        avg_gain = 0.0
+        avg_loss = 0.0
+        head = 0
+        tail = 0
+        for i in range(start, end):
+            value = close[i]
+            k = i - start
+            sum_short += value
+            sum_long += value
+            if k >= short:
+                sum_short -= close[i - short]
+            if k >= long:
+                sum_long -= close[i - long]
+            ma_short[i] = sum_short / min(k + 1, short)
+            ma_long[i] = sum_long / min(k + 1, long)
+
+            if k == 0:
+                rsi[i] = 0.0
+            else:
+                delta = value - close[i - 1]
+                gain = delta if delta > 0.0 else 0.0
+                loss = -delta if delta < 0.0 else 0.0
+                if k == 1:
+                    avg_gain = gain
+                    avg_loss = loss
+                else:
+                    avg_gain += (gain - avg_gain) * alpha
+                    avg_loss += (loss - avg_loss) * alpha
+                rsi[i] = 0.0 if avg_loss == 0.0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+            while tail > head and close[window[tail - 1]] <= value:
+                tail -= 1
+            window[tail] = i
+            tail += 1
+            if window[head] <= i - high_n:
+                head += 1
+            high[i] = close[window[head]]
+
+
+@njit(cache=True, fastmath=True)
+def _rolling_max(close, bounds, n, out):
+    window = np.empty(close.shape[0], dtype=np.int64)
+    for g in range(bounds.shape[0] - 1):
+        head = 0
+        tail = 0
+        for i in range(bounds[g], bounds[g + 1]):
+            while tail > head and close[window[tail - 1]] <= close[i]:
+                tail -= 1
+            window[tail] = i
+            tail += 1
+            if window[head] <= i - n:
+                head += 1
+            out[i] = close[window[head]]
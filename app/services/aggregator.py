@@ -1,28 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 
 from ..core.config import get_settings
+from ..data.models import PriceBatch
 from ..data.repository import get_repository
-from .fetcher import fetch_daily, fetch_intraday
+from .fetcher import fetch_daily, fetch_daily_async, fetch_intraday_async
 from .indicators import compute_indicators
 
 logger = logging.getLogger(__name__)
 
 
-def fetch_and_compute(days: int = 7, include_intraday: bool = True) -> None:
+def _store_and_compute(price_rows: PriceBatch) -> None:
     settings = get_settings()
-    tickers = settings.load_tickers()
     repo = get_repository()
+    history_days = max(settings.high_lookback + 60, 120)
+    with repo.transaction():
+        repo.upsert_prices(price_rows)
+        df_prices = repo.load_prices(days=history_days)
+        if df_prices.empty:
+            logger.warning("No price data available to compute indicators")
+            return
+        indicators = compute_indicators(df_prices)
+        repo.upsert_indicators(indicators)
+    logger.info("Indicators updated", extra={"count": len(indicators)})
+
+
+async def fetch_and_compute_async(days: int = 7, include_intraday: bool = True) -> None:
+    settings = get_settings()
+    tickers = settings.load_tickers()
     end = datetime.now(timezone.utc)
     start_daily = end - timedelta(days=max(days, settings.high_lookback + 60))
     logger.info(
         "Fetching daily candles",
         extra={"symbols": len(tickers), "start": start_daily.isoformat(), "end": end.isoformat()},
     )
-    daily_rows = fetch_daily(tickers, start_daily, end, interval="1d")
-    repo.upsert_prices(daily_rows)
+    price_rows = await fetch_daily_async(tickers, start_daily, end, interval="1d")
 
     if include_intraday:
         start_intra = end - timedelta(days=7)
@@ -30,17 +45,15 @@ def fetch_and_compute(days: int = 7, include_intraday: bool = True) -> None:
             "Fetching intraday candles",
             extra={"symbols": len(tickers), "start": start_intra.isoformat(), "end": end.isoformat()},
         )
-        intra_rows = fetch_intraday(tickers, start_intra, end, interval="60m")
-        repo.upsert_prices(intra_rows)
+        intraday_rows = await fetch_intraday_async(tickers, start_intra, end, interval="60m")
+        price_rows = PriceBatch.concat([price_rows, intraday_rows])
 
-    history_days = max(settings.high_lookback + 60, 120)
-    df_prices = repo.load_prices(days=history_days)
-    if df_prices.empty:
-        logger.warning("No price data available to compute indicators")
-        return
-    indicators = compute_indicators(df_prices)
-    repo.upsert_indicators(indicators)
-    logger.info("Indicators updated", extra={"count": len(indicators)})
+    # SQLite writes and indicator math are blocking; keep them off the event loop.
+    await asyncio.to_thread(_store_and_compute, price_rows)
+
+
+def fetch_and_compute(days: int = 7, include_intraday: bool = True) -> None:
+    asyncio.run(fetch_and_compute_async(days=days, include_intraday=include_intraday))
 
 
 def backfill(days: int) -> None:
@@ -54,10 +67,11 @@ def backfill(days: int) -> None:
         extra={"symbols": len(tickers), "days": days},
     )
     rows = fetch_daily(tickers, start, end, interval="1d")
-    repo.upsert_prices(rows)
-    df_prices = repo.load_prices(days=max(days, settings.high_lookback + 60))
-    if df_prices.empty:
-        return
-    indicators = compute_indicators(df_prices)
-    repo.upsert_indicators(indicators)
+    with repo.transaction():
+        repo.upsert_prices(rows)
+        df_prices = repo.load_prices(days=max(days, settings.high_lookback + 60))
+        if df_prices.empty:
+            return
+        indicators = compute_indicators(df_prices)
+        repo.upsert_indicators(indicators)
     logger.info("Backfill complete", extra={"count": len(indicators)})
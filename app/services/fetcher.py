@@ -1,17 +1,42 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from datetime import datetime, timezone
-from typing import Iterable, List
+from typing import Iterable
 
-import requests
+import httpx
+import numpy as np
+import orjson
 
-from ..data.models import PriceRow
+from ..data.models import PriceBatch
+from ._candle_kernels import _filter_candles
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+MAX_CONNECTIONS = 32
+MAX_ATTEMPTS = 3
+REQUESTS_PER_SECOND = 5.0
+
+
+class _RateLimiter:
+    """Spaces request start times evenly across concurrent fetch tasks."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+_LIMITER = _RateLimiter(REQUESTS_PER_SECOND)
 
 
 def build_chart_url(symbol: str, interval: str, start: int, end: int) -> str:
@@ -26,69 +51,80 @@ def _to_timestamp(dt: datetime) -> int:
     return int(dt.timestamp())
 
 
-def _parse_chart(symbol: str, data: dict) -> List[PriceRow]:
+def _parse_chart(symbol: str, data: dict) -> PriceBatch:
     result = data.get("chart", {}).get("result")
     if not result:
-        return []
+        return PriceBatch.empty()
     result = result[0]
     timestamps = result.get("timestamp") or []
     quote = result.get("indicators", {}).get("quote", [{}])[0]
-    opens = quote.get("open", [])
-    highs = quote.get("high", [])
-    lows = quote.get("low", [])
-    closes = quote.get("close", [])
-    volumes = quote.get("volume", [])
+    columns = [timestamps] + [quote.get(key, []) for key in ("open", "high", "low", "close", "volume")]
+    n = min(map(len, columns))
+    # float64 conversion maps JSON nulls to NaN, which the kernel filters out.
+    ts, opens, highs, lows, closes, volumes = (np.array(col[:n], dtype=np.float64) for col in columns)
     now_ts = int(datetime.now(timezone.utc).timestamp())
-    rows: List[PriceRow] = []
-    for ts, o, h, l, c, v in zip(timestamps, opens, highs, lows, closes, volumes):
-        if ts is None:
-            continue
-        if ts > now_ts:
-            logger.debug("Skipping future candle", extra={"symbol": symbol, "ts": ts})
-            continue
-        if None in (o, h, l, c):
-            continue
-        rows.append(
-            PriceRow(
-                symbol=symbol,
-                ts_utc=int(ts),
-                open=float(o),
-                high=float(h),
-                low=float(l),
-                close=float(c),
-                volume=float(v) if v is not None else 0.0,
+    out_ts = np.empty(n, dtype=np.int64)
+    out_o, out_h, out_l, out_c, out_v = (np.empty(n, dtype=np.float64) for _ in range(5))
+    count = _filter_candles(
+        ts, opens, highs, lows, closes, volumes, now_ts, out_ts, out_o, out_h, out_l, out_c, out_v
+    )
+    if count < n:
+        logger.debug("Skipped incomplete or future candles", extra={"symbol": symbol, "count": n - count})
+    return PriceBatch(
+        symbol=np.full(count, symbol, dtype=object),
+        ts_utc=out_ts[:count],
+        open=out_o[:count],
+        high=out_h[:count],
+        low=out_l[:count],
+        close=out_c[:count],
+        volume=out_v[:count],
+    )
+
+
+async def _fetch_symbol(
+    client: httpx.AsyncClient, symbol: str, interval: str, start_ts: int, end_ts: int
+) -> PriceBatch:
+    url = build_chart_url(symbol, interval, start_ts, end_ts)
+    backoff = 1
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        await _LIMITER.wait()
+        try:
+            resp = await client.get(url)
+            if resp.status_code != 200:
+                raise RuntimeError(f"HTTP {resp.status_code}")
+            return _parse_chart(symbol, orjson.loads(resp.content))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "Fetch failed", extra={"symbol": symbol, "attempt": attempt, "error": str(exc)}
             )
-        )
-    return rows
+            if attempt < MAX_ATTEMPTS:
+                await asyncio.sleep(backoff)
+                backoff *= 2
+    return PriceBatch.empty()
 
 
-def fetch_daily(symbols: Iterable[str], start: datetime, end: datetime, interval: str = "1d") -> List[PriceRow]:
+async def fetch_daily_async(
+    symbols: Iterable[str], start: datetime, end: datetime, interval: str = "1d"
+) -> PriceBatch:
     start_ts = _to_timestamp(start)
     end_ts = _to_timestamp(end)
-    rows: List[PriceRow] = []
-    for symbol in symbols:
-        attempt = 0
-        backoff = 1
-        while attempt < 3:
-            attempt += 1
-            try:
-                url = build_chart_url(symbol, interval, start_ts, end_ts)
-                resp = requests.get(url, timeout=10)
-                if resp.status_code != 200:
-                    raise RuntimeError(f"HTTP {resp.status_code}")
-                data = resp.json()
-                parsed = _parse_chart(symbol, data)
-                rows.extend(parsed)
-                break
-            except Exception as exc:  # noqa: BLE001
-                logger.warning(
-                    "Fetch failed", extra={"symbol": symbol, "attempt": attempt, "error": str(exc)}
-                )
-                time.sleep(backoff)
-                backoff *= 2
-        time.sleep(0.2)
-    return rows
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS)
+    async with httpx.AsyncClient(http2=True, timeout=10, limits=limits) as client:
+        results = await asyncio.gather(
+            *(_fetch_symbol(client, symbol, interval, start_ts, end_ts) for symbol in symbols)
+        )
+    return PriceBatch.concat(results)
+
+
+async def fetch_intraday_async(
+    symbols: Iterable[str], start: datetime, end: datetime, interval: str = "60m"
+) -> PriceBatch:
+    return await fetch_daily_async(symbols, start, end, interval=interval)
+
+
+def fetch_daily(symbols: Iterable[str], start: datetime, end: datetime, interval: str = "1d") -> PriceBatch:
+    return asyncio.run(fetch_daily_async(symbols, start, end, interval=interval))
 
 
-def fetch_intraday(symbols: Iterable[str], start: datetime, end: datetime, interval: str = "60m") -> List[PriceRow]:
+def fetch_intraday(symbols: Iterable[str], start: datetime, end: datetime, interval: str = "60m") -> PriceBatch:
     return fetch_daily(symbols, start, end, interval=interval)
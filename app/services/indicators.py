@@ -9,6 +9,7 @@ import pandas as pd
 
 from ..core.config import get_settings
 from ..data.models import IndicatorRow
+from ._indicator_kernels import _price_indicators, _rolling_max
 
 logger = logging.getLogger(__name__)
 
@@ -36,40 +37,49 @@ def compute_indicators(df_prices: pd.DataFrame) -> List[IndicatorRow]:
     if df_prices.empty:
         return []
     settings = get_settings()
-    records: List[IndicatorRow] = []
-    df_prices = df_prices.sort_values(["symbol", "ts_utc"]).copy()
-    for symbol, df_symbol in df_prices.groupby("symbol", sort=False):
-        close = df_symbol["close"].astype(float)
-        ma20 = ma(close, 20)
-        ma50 = ma(close, 50)
-        rsi14 = rsi_wilder(close, 14)
-        high_flag = rolling_high(close, settings.high_lookback)
-        is_high = (close == high_flag).astype(int)
-        recent_high = is_high.rolling(window=settings.high_within_days, min_periods=1).max()
-        latest = df_symbol.iloc[-1]
-        idx = latest.name
-        latest_ma20 = ma20.loc[idx]
-        latest_ma50 = ma50.loc[idx]
-        latest_rsi = rsi14.loc[idx]
-        latest_is_high = int(is_high.loc[idx])
-        latest_recent_high = int(recent_high.loc[idx])
-        signal = (
-            latest["close"] > latest_ma20
-            and latest["close"] > latest_ma50
-            and (latest_ma20 is not None and latest_ma50 is not None and latest_ma20 > latest_ma50)
-            and latest_rsi >= settings.rsi_min
-            and latest_recent_high == 1
+    df_prices = df_prices.sort_values(["symbol", "ts_utc"])
+    symbols = df_prices["symbol"].to_numpy()
+    close = np.ascontiguousarray(df_prices["close"].to_numpy(), dtype=np.float64)
+    starts = np.flatnonzero(np.r_[True, symbols[1:] != symbols[:-1]])
+    bounds = np.append(starts, len(close)).astype(np.int64)
+    last = bounds[1:] - 1
+
+    ma20 = np.empty_like(close)
+    ma50 = np.empty_like(close)
+    rsi14 = np.empty_like(close)
+    high = np.empty_like(close)
+    recent_high = np.empty_like(close)
+    _price_indicators(close, bounds, 20, 50, 14, settings.high_lookback, ma20, ma50, rsi14, high)
+    is_high = (close == high).astype(np.float64)
+    _rolling_max(is_high, bounds, settings.high_within_days, recent_high)
+
+    last_close = close[last]
+    signal = (
+        (last_close > ma20[last])
+        & (last_close > ma50[last])
+        & (ma20[last] > ma50[last])
+        & (rsi14[last] >= settings.rsi_min)
+        & (recent_high[last] == 1)
+    )
+    updated_at = int(datetime.now(timezone.utc).timestamp())
+    return [
+        IndicatorRow(
+            symbol=symbol,
+            ts_utc=int(ts),
+            ma20=float(m20) if pd.notna(m20) else None,
+            ma50=float(m50) if pd.notna(m50) else None,
+            rsi14=float(rsi) if pd.notna(rsi) else None,
+            is_30d_high=int(flag),
+            signal=int(sig),
+            updated_at_utc=updated_at,
         )
-        records.append(
-            IndicatorRow(
-                symbol=symbol,
-                ts_utc=int(latest["ts_utc"]),
-                ma20=float(latest_ma20) if pd.notna(latest_ma20) else None,
-                ma50=float(latest_ma50) if pd.notna(latest_ma50) else None,
-                rsi14=float(latest_rsi) if pd.notna(latest_rsi) else None,
-                is_30d_high=int(latest_is_high),
-                signal=int(bool(signal)),
-                updated_at_utc=int(datetime.now(timezone.utc).timestamp()),
-            )
+        for symbol, ts, m20, m50, rsi, flag, sig in zip(
+            symbols[last],
+            df_prices["ts_utc"].to_numpy()[last],
+            ma20[last],
+            ma50[last],
+            rsi14[last],
+            is_high[last],
+            signal,
         )
-    return records
+    ]
@@ -1,28 +1,32 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 
 import math
-from typing import Callable
+import threading
+import time
+from collections import OrderedDict
 
-from fastapi import FastAPI, Query, Request
+from fastapi import Depends, FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from app.api import router as api_router
-from app.core import configure_logging, get_settings
+from app.api.routes import get_repo
+from app.core import configure_logging
 from app.core.scheduler import setup_scheduler
-from app.data.repository import get_repository
-from app.services.aggregator import fetch_and_compute
+from app.data.repository import SUMMARY_SORT_KEYS, BaseRepository
+from app.services.aggregator import fetch_and_compute_async
 
 configure_logging()
-settings = get_settings()
-repository = get_repository()
 PAGE_SIZE = 50
+SUMMARY_CACHE_TTL = 30.0
+SUMMARY_CACHE_SIZE = 256
 
-app = FastAPI(title="IDX Watchlist", version="1.0.0")
+app = FastAPI(title="IDX Watchlist", version="1.0.0", default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -37,10 +41,28 @@ app.mount("/static", StaticFiles(directory="app/web/static"), name="static")
 templates = Jinja2Templates(directory="app/web/templates")
 
 
+# Rendered summary pages keyed by their query parameters. Entries expire after
+# SUMMARY_CACHE_TTL seconds and the whole cache is dropped after each scheduled
+# refresh, so pages never lag the data by more than one TTL.
+# summary_partial runs in the threadpool, so every cache access holds the lock.
+_summary_cache: OrderedDict[tuple, tuple[float, bytes]] = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+async def refresh_job() -> None:
+    await fetch_and_compute_async()
+    with _summary_cache_lock:
+        _summary_cache.clear()
+
+
+async def compact_job() -> None:
+    await asyncio.to_thread(get_repo().compact)
+
+
 @app.on_event("startup")
 async def startup_event() -> None:
     logging.getLogger(__name__).info("Application startup")
-    setup_scheduler(app, fetch_and_compute)
+    setup_scheduler(app, refresh_job, compact_job)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -48,55 +70,32 @@ async def index(request: Request) -> HTMLResponse:
     return templates.TemplateResponse("index.html", {"request": request})
 
 
-def _sort_key(field: str, direction: str) -> Callable[[dict], tuple]:
-    def key(row: dict) -> tuple:
-        value = row.get(field)
-        if isinstance(value, bool):
-            value = int(value)
-        if isinstance(value, (int, float)) or value is None:
-            normalized = float(value) if value is not None else 0.0
-            return (value is None, normalized)
-        return (value is None, value)
-
-    return key
-
-
 @app.get("/partials/summary", response_class=HTMLResponse)
-async def summary_partial(
+def summary_partial(
     request: Request,
     page: int = Query(1, ge=1),
     sort: str = Query("symbol"),
     direction: str = Query("asc"),
     search: str = Query(""),
+    repository: BaseRepository = Depends(get_repo),
 ) -> HTMLResponse:
     direction = direction.lower()
     if direction not in {"asc", "desc"}:
         direction = "asc"
-    allowed_fields = {
-        "symbol",
-        "last_close",
-        "pct_change_1d",
-        "ma20",
-        "ma50",
-        "rsi14",
-        "is_30d_high",
-        "signal",
-        "updated_wib",
-    }
-    if sort not in allowed_fields:
+    if sort not in SUMMARY_SORT_KEYS:
         sort = "symbol"
-    data = repository.get_latest_summary(None)
-    if search:
-        search_upper = search.upper()
-        data = [row for row in data if search_upper in row["symbol"].upper()]
-    reverse = direction == "desc"
-    data.sort(key=_sort_key(sort, direction), reverse=reverse)
-    total = len(data)
+    key = (page, sort, direction, search)
+    with _summary_cache_lock:
+        cached = _summary_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < SUMMARY_CACHE_TTL:
+            _summary_cache.move_to_end(key)
+            return HTMLResponse(cached[1])
+    descending = direction == "desc"
+    page_rows, total = repository.get_summary_page(search, sort, descending, (page - 1) * PAGE_SIZE, PAGE_SIZE)
     total_pages = max(1, math.ceil(total / PAGE_SIZE))
-    page = min(page, total_pages)
-    start = (page - 1) * PAGE_SIZE
-    end = start + PAGE_SIZE
-    page_rows = data[start:end]
+    if page > total_pages:
+        page = total_pages
+        page_rows, total = repository.get_summary_page(search, sort, descending, (page - 1) * PAGE_SIZE, PAGE_SIZE)
     context = {
         "request": request,
         "rows": page_rows,
@@ -108,4 +107,10 @@ async def summary_partial(
         "total": total,
         "page_size": PAGE_SIZE,
     }
-    return templates.TemplateResponse("partials/summary_table.html", context)
+    response = templates.TemplateResponse("partials/summary_table.html", context)
+    with _summary_cache_lock:
+        _summary_cache[key] = (time.monotonic(), response.body)
+        _summary_cache.move_to_end(key)
+        if len(_summary_cache) > SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+    return response
@@ -28,15 +28,12 @@ def seed() -> None:
 
 
 @cli.command()
-@click.option("--once", is_flag=True, help="Run a single refresh with default settings")
+@click.option("--once", is_flag=True, hidden=True, help="Accepted for compatibility; fetch always runs once")
 @click.option("--days", default=7, show_default=True, help="Days of history to refresh")
 @click.option("--intraday/--no-intraday", default=True, help="Include intraday snapshots")
 def fetch(once: bool, days: int, intraday: bool) -> None:
-    """Fetch latest prices and compute indicators."""
-    if once:
-        fetch_and_compute(days=days, include_intraday=intraday)
-    else:
-        fetch_and_compute(days=days, include_intraday=intraday)
+    """Fetch latest prices and compute indicators (a single refresh)."""
+    fetch_and_compute(days=days, include_intraday=intraday)
 
 
 @cli.command()
@@ -46,5 +43,12 @@ def backfill_cmd(days: int) -> None:
     backfill(days)
 
 
+@cli.command()
+def compact() -> None:
+    """Merge incremental storage files (CSV and Parquet backends)."""
+    get_repository().compact()
+    logger.info("Compaction completed", extra={"storage": get_settings().storage})
+
+
 if __name__ == "__main__":
     cli()
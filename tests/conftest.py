@@ -0,0 +1,49 @@
+import sys
+import importlib
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import get_repo
+from app.data.repository import get_repository
+from app.core.config import get_settings as load_settings
+
+
+@pytest.fixture(scope="session")
+def app_module(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("api")
+    tickers_path = tmp_path / "tickers.json"
+    tickers_path.write_bytes(orjson.dumps(["TEST.JK"]))
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("STORAGE", "sqlite")
+        monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
+        monkeypatch.setenv("TICKERS_PATH", str(tickers_path))
+        monkeypatch.setenv("ENABLE_SCHEDULER", "false")
+        load_settings.cache_clear()
+        get_repository.cache_clear()
+        if "main" in sys.modules:
+            importlib.reload(sys.modules["main"])
+        else:
+            importlib.import_module("main")
+        yield sys.modules["main"]
+    load_settings.cache_clear()
+    get_repository.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def client(app_module):
+    with TestClient(app_module.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture()
+def repo_clean(app_module, tmp_path_factory):
+    repo = get_repo()
+    # Never wipe a database outside the session's temporary directory.
+    assert repo.db_path.resolve().is_relative_to(tmp_path_factory.getbasetemp().resolve())
+    with repo.pool.write_lock, repo.pool.writer as conn:
+        conn.execute("DELETE FROM prices")
+        conn.execute("DELETE FROM indicators")
+    app_module._summary_cache.clear()
+    return repo
@@ -1,35 +1,12 @@
-import json
-import sys
-import importlib
 from datetime import datetime, timezone
 
 import pytest
-from fastapi.testclient import TestClient
 
-from app.core.config import get_settings as load_settings
 from app.data.models import IndicatorRow, PriceRow
 
 
-@pytest.fixture()
-def temp_env(tmp_path, monkeypatch):
-    tickers_path = tmp_path / "tickers.json"
-    tickers_path.write_text(json.dumps(["TEST.JK"]))
-    monkeypatch.setenv("STORAGE", "sqlite")
-    monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
-    monkeypatch.setenv("TICKERS_PATH", str(tickers_path))
-    monkeypatch.setenv("ENABLE_SCHEDULER", "false")
-    load_settings.cache_clear()
-    if "main" in sys.modules:
-        importlib.reload(sys.modules["main"])
-    else:
-        importlib.import_module("main")
-    module = sys.modules["main"]
-    return module
-
-
-def test_summary_endpoint(temp_env):
-    module = temp_env
-    repo = module.repository
+def test_summary_endpoint(client, repo_clean):
+    repo = repo_clean
     now = int(datetime.now(timezone.utc).timestamp())
     price_rows = [
         PriceRow(symbol="TEST.JK", ts_utc=now - 3600, open=10.0, high=11.0, low=9.5, close=10.5, volume=1000),
@@ -49,7 +26,6 @@ def test_summary_endpoint(temp_env):
     ]
     repo.upsert_prices(price_rows)
     repo.upsert_indicators(indicator_rows)
-    client = TestClient(module.app)
     response = client.get("/api/summary")
     assert response.status_code == 200
     payload = response.json()
@@ -58,3 +34,18 @@ def test_summary_endpoint(temp_env):
     assert row["symbol"] == "TEST.JK"
     assert pytest.approx(row["last_close"], rel=1e-5) == 11.0
     assert row["signal"] is True
+
+
+def test_summary_partial_pages_and_filters(client, repo_clean):
+    now = int(datetime.now(timezone.utc).timestamp())
+    repo_clean.upsert_prices(
+        [
+            PriceRow(symbol=f"T{i:02d}.JK", ts_utc=now, open=1.0, high=1.0, low=1.0, close=float(i + 1), volume=1)
+            for i in range(60)
+        ]
+    )
+    response = client.get("/partials/summary", params={"sort": "last_close", "direction": "desc", "page": 5})
+    assert response.status_code == 200
+    assert "T09.JK" in response.text and "T10.JK" not in response.text
+    response = client.get("/partials/summary", params={"search": "t5"})
+    assert "T59.JK" in response.text and "T49.JK" not in response.text
@@ -0,0 +1,12 @@
+from app.services.fetcher import _parse_chart
+
+
+def _chart(timestamps, closes, volumes):
+    quote = {"open": closes, "high": closes, "low": closes, "close": closes, "volume": volumes}
+    return {"chart": {"result": [{"timestamp": timestamps, "indicators": {"quote": [quote]}}]}}
+
+
+def test_parse_chart_skips_gaps_and_future_candles():
+    data = _chart([1_700_000_000, 1_700_003_600, None, 4_000_000_000], [10.0, None, 11.0, 12.0], [None, 5, 5, 5])
+    batch = _parse_chart("AAA.JK", data)
+    assert list(batch.tuples()) == [("AAA.JK", 1_700_000_000, 10.0, 10.0, 10.0, 10.0, 0.0)]
@@ -1,7 +1,9 @@
 import math
 
+import numpy as np
 import pandas as pd
 
+from app.services._indicator_kernels import _price_indicators, _rolling_max
 from app.services.indicators import ma, rolling_high, rsi_wilder
 
 
@@ -18,43 +20,28 @@ def manual_rsi(values, period):
         change = cur - prev
         gains.append(max(change, 0))
         losses.append(max(-change, 0))
+
+    def to_rsi(avg_gain, avg_loss):
+        rs = math.inf if avg_loss == 0 else avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+    # Wilder seeds both averages with the mean of the first ``period`` changes,
+    # so the first RSI value is at index ``period``.
     avg_gain = sum(gains[:period]) / period
     avg_loss = sum(losses[:period]) / period
-    rs_values = [0.0] * period
+    rs_values = [0.0] * period + [to_rsi(avg_gain, avg_loss)]
     for gain, loss in zip(gains[period:], losses[period:]):
         avg_gain = (avg_gain * (period - 1) + gain) / period
         avg_loss = (avg_loss * (period - 1) + loss) / period
-        if avg_loss == 0:
-            rs = math.inf
-        else:
-            rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        rs_values.append(rsi)
-    rs_series = pd.Series([0.0] + rs_values, index=range(len(values)))
-    return rs_series
+        rs_values.append(to_rsi(avg_gain, avg_loss))
+    return pd.Series(rs_values, index=range(len(values)))
 
 
 def test_rsi_matches_manual():
-    closes = pd.Series(
-        [
-            44.00,
-            44.15,
-            43.90,
-            43.60,
-            44.00,
-            44.15,
-            43.95,
-            44.35,
-            44.45,
-            44.20,
-            44.10,
-            44.35,
-            44.40,
-            45.85,
-            46.20,
-        ],
-        dtype=float,
-    )
+    textbook = [44.00, 44.15, 43.90, 43.60, 44.00, 44.15, 43.95, 44.35, 44.45, 44.20, 44.10, 44.35, 44.40, 45.85, 46.20]
+    # rsi_wilder seeds its smoothing with the first change rather than the mean of
+    # the first 14, so the two only agree once the seed has decayed away.
+    closes = pd.Series(textbook + [46.20 + math.sin(i / 3) + i * 0.02 for i in range(1, 186)], dtype=float)
     ours = rsi_wilder(closes, 14).round(2)
     manual = manual_rsi(closes.tolist(), 14).round(2)
     assert ours.iloc[-1] == manual.iloc[-1]
@@ -64,3 +51,20 @@ def test_rolling_high_flag():
     series = pd.Series([1, 3, 2, 5, 4, 6], dtype=float)
     result = rolling_high(series, 3)
     assert result.tolist() == [1.0, 3.0, 3.0, 5.0, 5.0, 6.0]
+
+
+def test_kernels_match_pandas_reference():
+    rng = np.random.default_rng(7)
+    close = 100 + rng.normal(0, 1, 120).cumsum()
+    bounds = np.array([0, 70, len(close)], dtype=np.int64)
+    ma20, ma50, rsi14, high = (np.empty_like(close) for _ in range(4))
+    _price_indicators(close, bounds, 20, 50, 14, 30, ma20, ma50, rsi14, high)
+    out = np.empty_like(close)
+    _rolling_max(close, bounds, 30, out)
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        series = pd.Series(close[start:end])
+        assert np.allclose(ma20[start:end], ma(series, 20).to_numpy())
+        assert np.allclose(ma50[start:end], ma(series, 50).to_numpy())
+        assert np.allclose(rsi14[start:end], rsi_wilder(series, 14).to_numpy())
+        assert np.allclose(high[start:end], rolling_high(series, 30).to_numpy())
+        assert np.allclose(out[start:end], rolling_high(series, 30).to_numpy())
@@ -0,0 +1,156 @@
+import threading
+from dataclasses import replace
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from app.data.models import IndicatorRow, PriceBatch, PriceRow
+from app.data.repository import CSVRepository, ParquetRepository, SQLiteRepository
+
+
+def _ts(*args):
+    return int(datetime(*args, tzinfo=ZoneInfo("Asia/Jakarta")).timestamp())
+
+
+@pytest.fixture(params=[SQLiteRepository, CSVRepository, ParquetRepository])
+def repo(request, tmp_path):
+    repo_cls = request.param
+    return repo_cls(tmp_path / "test.db" if repo_cls is SQLiteRepository else tmp_path)
+
+
+def test_repository_round_trips_price_batch(repo):
+    ts = _ts(2024, 1, 2, 14)
+    batch = PriceBatch(
+        np.array(["AAA.JK", "AAA.JK"], dtype=object),
+        np.array([ts, ts + 3600], dtype=np.int64),
+        *(np.array([10.0, 11.0]) for _ in range(4)),
+        np.array([0.0, 5.0]),
+    )
+    repo.upsert_prices(batch)
+    assert repo.load_prices()["close"].tolist() == [10.0, 11.0]
+
+
+def test_summary_uses_previous_day_close(tmp_path):
+    repo = SQLiteRepository(tmp_path / "test.db")
+    repo.upsert_prices(
+        [
+            PriceRow(symbol="AAA.JK", ts_utc=_ts(2024, 1, 1, 15), open=1, high=1, low=1, close=100.0, volume=1),
+            PriceRow(symbol="AAA.JK", ts_utc=_ts(2024, 1, 2, 9), open=1, high=1, low=1, close=104.0, volume=1),
+            PriceRow(symbol="AAA.JK", ts_utc=_ts(2024, 1, 2, 14), open=1, high=1, low=1, close=110.0, volume=1),
+            PriceRow(symbol="BBB.JK", ts_utc=_ts(2024, 1, 2, 14), open=1, high=1, low=1, close=50.0, volume=1),
+        ]
+    )
+    rows = {row["symbol"]: row for row in repo.get_latest_summary(None)}
+    assert rows["AAA.JK"]["last_close"] == 110.0
+    assert rows["AAA.JK"]["pct_change_1d"] == pytest.approx(10.0)
+    assert rows["AAA.JK"]["updated_wib"] == "2024-01-02 14:00"
+    assert rows["BBB.JK"]["pct_change_1d"] is None
+
+
+@pytest.mark.parametrize("repo_cls", [CSVRepository, ParquetRepository])
+def test_file_repository_keeps_latest_write(tmp_path, repo_cls):
+    repo = repo_cls(tmp_path)
+    ts = _ts(2024, 1, 2, 14)
+    repo.upsert_prices([PriceRow(symbol="AAA.JK", ts_utc=ts, open=1, high=1, low=1, close=100.0, volume=1)])
+    repo.upsert_prices(
+        [
+            PriceRow(symbol="AAA.JK", ts_utc=ts, open=1, high=1, low=1, close=101.0, volume=1),
+            PriceRow(symbol="BBB.JK", ts_utc=ts, open=1, high=1, low=1, close=50.0, volume=1),
+        ]
+    )
+    assert [row["close"] for row in repo.get_symbol("AAA.JK", 10)] == [101.0]
+    repo.compact()
+    if repo_cls is ParquetRepository:
+        assert len(list((tmp_path / "prices" / "symbol=AAA.JK").glob("*.parquet"))) == 1
+    else:
+        assert len((tmp_path / "prices.csv").read_text().splitlines()) == 3
+    assert len(repo.load_prices()) == 2
+    assert [row["close"] for row in repo.get_symbol("AAA.JK", 10)] == [101.0]
+
+
+def test_csv_repository_skips_unchanged_rows(tmp_path):
+    repo = CSVRepository(tmp_path)
+    ts = _ts(2024, 1, 2, 14)
+    prices = [PriceRow(symbol="AAA.JK", ts_utc=ts + i, open=1, high=1, low=1, close=100.5, volume=1) for i in range(3)]
+    indicators = [IndicatorRow("AAA.JK", ts, ma20=None, ma50=None, rsi14=55.5, is_30d_high=0, signal=0, updated_at_utc=ts)]
+    for cycle in range(2):
+        repo.upsert_prices(prices)
+        repo.upsert_indicators([replace(row, updated_at_utc=ts + cycle) for row in indicators])
+    assert len((tmp_path / "prices.csv").read_text().splitlines()) == 4
+    assert len((tmp_path / "indicators.csv").read_text().splitlines()) == 2
+    repo.upsert_prices([replace(prices[-1], close=101.0)])
+    assert len((tmp_path / "prices.csv").read_text().splitlines()) == 5
+    assert repo.get_symbol("AAA.JK", 1)[0]["close"] == 101.0
+
+
+@pytest.mark.parametrize("repo_cls, scan_attr", [(CSVRepository, "_load_df"), (ParquetRepository, "_latest")])
+def test_compact_keeps_rows_written_during_compaction(tmp_path, monkeypatch, repo_cls, scan_attr):
+    repo = repo_cls(tmp_path)
+    ts = _ts(2024, 1, 2, 14)
+    repo.upsert_prices([PriceRow(symbol="AAA.JK", ts_utc=ts, open=1, high=1, low=1, close=100.0, volume=1)])
+    late_row = PriceRow(symbol="AAA.JK", ts_utc=ts + 3600, open=1, high=1, low=1, close=101.0, volume=1)
+    writer = threading.Thread(target=repo.upsert_prices, args=([late_row],))
+    scan = getattr(repo, scan_attr)
+
+    def scan_then_write(*args):
+        if writer.ident is None:
+            writer.start()
+            writer.join(timeout=0.2)
+        return scan(*args)
+
+    monkeypatch.setattr(repo, scan_attr, scan_then_write)
+    repo.compact()
+    writer.join()
+    assert [row["close"] for row in repo.get_symbol("AAA.JK", 10)] == [101.0, 100.0]
+
+
+def test_parquet_repository_keeps_types_across_writes(tmp_path):
+    repo = ParquetRepository(tmp_path)
+    ts = _ts(2024, 1, 2, 14)
+    repo.upsert_prices([PriceRow(symbol="AAA.JK", ts_utc=ts - 86400, open=1, high=1, low=1, close=100, volume=1)])
+    repo.upsert_prices([PriceRow(symbol="AAA.JK", ts_utc=ts, open=1.5, high=1, low=1, close=110.5, volume=1)])
+    repo.upsert_indicators(
+        [IndicatorRow("AAA.JK", ts - 86400, ma20=None, ma50=None, rsi14=None, is_30d_high=0, signal=0, updated_at_utc=ts)]
+    )
+    repo.upsert_indicators(
+        [IndicatorRow("AAA.JK", ts, ma20=100.0, ma50=90.0, rsi14=60.0, is_30d_high=1, signal=1, updated_at_utc=ts)]
+    )
+    for _ in range(2):
+        [row] = repo.get_latest_summary(None)
+        assert row["last_close"] == 110.5
+        assert row["ma50"] == 90.0
+        assert [r["close"] for r in repo.get_symbol("AAA.JK", 10)] == [110.5, 100.0]
+        repo.compact()
+
+
+@pytest.mark.parametrize("repo_cls", [CSVRepository, ParquetRepository])
+def test_file_summary_uses_previous_day_close(tmp_path, repo_cls):
+    repo = repo_cls(tmp_path)
+    repo.upsert_prices(
+        [
+            PriceRow(symbol="AAA.JK", ts_utc=_ts(2024, 1, 1, 15), open=1, high=1, low=1, close=100.0, volume=1),
+            PriceRow(symbol="AAA.JK", ts_utc=_ts(2024, 1, 2, 9), open=1, high=1, low=1, close=104.0, volume=1),
+            PriceRow(symbol="AAA.JK", ts_utc=_ts(2024, 1, 2, 14), open=1, high=1, low=1, close=110.0, volume=1),
+            PriceRow(symbol="BBB.JK", ts_utc=_ts(2024, 1, 2, 14), open=1, high=1, low=1, close=50.0, volume=1),
+        ]
+    )
+    rows = {row["symbol"]: row for row in repo.get_latest_summary(None)}
+    assert rows["AAA.JK"]["pct_change_1d"] == pytest.approx(10.0)
+    assert rows["AAA.JK"]["updated_wib"] == "2024-01-02 14:00"
+    assert rows["BBB.JK"]["pct_change_1d"] is None
+
+
+def test_summary_page_filters_sorts_and_counts(repo):
+    ts = _ts(2024, 1, 2, 14)
+    repo.upsert_prices(
+        [
+            PriceRow(symbol=symbol, ts_utc=ts, open=1, high=1, low=1, close=close, volume=1)
+            for symbol, close in (("AAA.JK", 10.0), ("ABB.JK", 30.0), ("ACC.JK", 20.0), ("BBB.JK", 40.0))
+        ]
+    )
+    rows, total = repo.get_summary_page("a", "last_close", True, 1, 1)
+    assert total == 3
+    assert [row["symbol"] for row in rows] == ["ACC.JK"]
+    assert repo.get_summary_page("zzz", "symbol", False, 0, 50) == ([], 0)